@@ -10,6 +10,12 @@ class Messages:
         " This can leave security holes in your login systems as attempts are not tracked correctly."
         " Reconfigure settings.AXES_CACHE and settings.CACHES per django-axes configuration documentation."
     )
+    CACHE_FAILURES_INVALID = (
+        "You are caching django-axes failure counts with settings.AXES_CACHE_FAILURES."
+        " Your cache configuration is however not shared between processes and cached counts can become stale."
+        " This can leave security holes in your login systems as lockouts are not enforced correctly."
+        " Reconfigure settings.AXES_CACHE and settings.CACHES per django-axes configuration documentation."
+    )
     MIDDLEWARE_INVALID = (
         "You do not have 'axes.middleware.AxesMiddleware' in your settings.MIDDLEWARE."
     )
@@ -23,6 +29,7 @@ class Messages:
 
 class Hints:
     CACHE_INVALID = None
+    CACHE_FAILURES_INVALID = None
     MIDDLEWARE_INVALID = None
     BACKEND_INVALID = 'AxesModelBackend was renamed to AxesBackend in django-axes version 5.0.'
     SETTING_DEPRECATED = None
@@ -33,6 +40,7 @@ class Codes:
     MIDDLEWARE_INVALID = 'axes.W002'
     BACKEND_INVALID = 'axes.W003'
     SETTING_DEPRECATED = 'axes.W004'
+    CACHE_FAILURES_INVALID = 'axes.W005'
 
 
 @register(Tags.security, Tags.caches, Tags.compatibility)
@@ -58,6 +66,13 @@ def axes_cache_check(app_configs, **kwargs):  # pylint: disable=unused-argument
                 hint=Hints.CACHE_INVALID,
                 id=Codes.CACHE_INVALID,
             ))
+    elif getattr(settings, 'AXES_CACHE_FAILURES', False):
+        if axes_cache_backend in axes_cache_backend_incompatible:
+            warnings.append(Warning(
+                msg=Messages.CACHE_FAILURES_INVALID,
+                hint=Hints.CACHE_FAILURES_INVALID,
+                id=Codes.CACHE_FAILURES_INVALID,
+            ))
 
     return warnings
 
@@ -1,8 +1,13 @@
+from typing import Callable, Dict, FrozenSet, Optional, Sequence, Union
+
 from django.conf import settings
+from django.core.signals import setting_changed
 from django.utils.translation import gettext_lazy as _
 
 from appconf import AppConf
 
+from axes.networks import IPNetworkSet
+
 
 class AxesAppConf(AppConf):
     # disable plugin when set to False
@@ -35,6 +40,12 @@ class AxesAppConf(AppConf):
     # reset the number of failed attempts after one successful attempt
     RESET_ON_SUCCESS = False
 
+    # cache failure counts of the database handler to skip queries for clients below the failure limit
+    CACHE_FAILURES = False
+
+    # cache access decisions for repeated requests by the same client for the given number of seconds
+    ALLOWED_CACHE_TIMEOUT = None
+
     DISABLE_ACCESS_LOG = False
 
     HANDLER = 'axes.handlers.database.AxesDatabaseHandler'
@@ -85,3 +96,126 @@ class AxesAppConf(AppConf):
             )
         )
     )
+
+
+# Bit flags for the IP address statuses in AxesSettingsSnapshot.AXES_IP_STATUSES
+IP_ADDRESS_BLACKLISTED = 1
+IP_ADDRESS_WHITELISTED = 2
+
+
+class AxesSettingsSnapshot:
+    """
+    Snapshot of the Axes settings that are read on every request.
+
+    Reading ``settings.AXES_*`` goes through the lazy settings proxy on every access,
+    so the request hot path reads the values from this snapshot instead.
+
+    The snapshot is refreshed in place whenever Django sends the ``setting_changed`` signal
+    for an Axes setting, e.g. when settings are changed with ``override_settings`` in tests.
+
+    The IP whitelist and blacklist iterables are stored as frozensets for constant time lookups,
+    and their entries in CIDR notation are additionally compiled into ``IPNetworkSet`` objects.
+    The addresses of both lists are also merged into a single mapping of IP address status bit flags.
+
+    The form fields that are excluded from logged request data are collected into a frozenset.
+    """
+
+    SETTINGS = (
+        'AXES_ENABLED',
+        'AXES_FAILURE_LIMIT',
+        'AXES_LOCK_OUT_AT_FAILURE',
+        'AXES_CACHE_FAILURES',
+        'AXES_ALLOWED_CACHE_TIMEOUT',
+        'AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP',
+        'AXES_ONLY_USER_FAILURES',
+        'AXES_USE_USER_AGENT',
+        'AXES_VERBOSE',
+        'AXES_USERNAME_FORM_FIELD',
+        'AXES_USERNAME_CALLABLE',
+        'AXES_PASSWORD_FORM_FIELD',
+        'AXES_NEVER_LOCKOUT_WHITELIST',
+        'AXES_NEVER_LOCKOUT_GET',
+        'AXES_ONLY_WHITELIST',
+        'AXES_IP_WHITELIST',
+        'AXES_IP_BLACKLIST',
+        'AXES_PROXY_ORDER',
+        'AXES_PROXY_COUNT',
+        'AXES_PROXY_TRUSTED_IPS',
+        'AXES_META_PRECEDENCE_ORDER',
+    )
+
+    __slots__ = SETTINGS + (
+        'AXES_IP_WHITELIST_NETWORKS',
+        'AXES_IP_BLACKLIST_NETWORKS',
+        'AXES_IP_STATUSES',
+        'AXES_PASSWORD_FORM_FIELDS',
+    )
+
+    AXES_ENABLED: bool
+    AXES_FAILURE_LIMIT: int
+    AXES_LOCK_OUT_AT_FAILURE: bool
+    AXES_CACHE_FAILURES: bool
+    AXES_ALLOWED_CACHE_TIMEOUT: Optional[int]
+    AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP: bool
+    AXES_ONLY_USER_FAILURES: bool
+    AXES_USE_USER_AGENT: bool
+    AXES_VERBOSE: bool
+    AXES_USERNAME_FORM_FIELD: str
+    AXES_USERNAME_CALLABLE: Optional[Union[str, Callable]]
+    AXES_PASSWORD_FORM_FIELD: str
+    AXES_NEVER_LOCKOUT_WHITELIST: bool
+    AXES_NEVER_LOCKOUT_GET: bool
+    AXES_ONLY_WHITELIST: bool
+    AXES_IP_WHITELIST: FrozenSet[str]
+    AXES_IP_BLACKLIST: FrozenSet[str]
+    AXES_PROXY_ORDER: str
+    AXES_PROXY_COUNT: Optional[int]
+    AXES_PROXY_TRUSTED_IPS: Optional[Sequence[str]]
+    AXES_META_PRECEDENCE_ORDER: Sequence[str]
+    AXES_IP_WHITELIST_NETWORKS: IPNetworkSet
+    AXES_IP_BLACKLIST_NETWORKS: IPNetworkSet
+    AXES_IP_STATUSES: Dict[str, int]
+    AXES_PASSWORD_FORM_FIELDS: FrozenSet[str]
+
+    def __init__(self):
+        self.reload()
+
+    def reload(self):
+        # Compute every value before assigning any of them, because the snapshot is shared
+        # and concurrent readers must not see e.g. the raw IP lists before their conversion
+        values = {name: getattr(settings, name) for name in self.SETTINGS}
+
+        ip_whitelist = frozenset(values['AXES_IP_WHITELIST'] or ())
+        ip_blacklist = frozenset(values['AXES_IP_BLACKLIST'] or ())
+
+        ip_statuses = {ip: IP_ADDRESS_BLACKLISTED for ip in ip_blacklist}
+        for ip in ip_whitelist:
+            ip_statuses[ip] = ip_statuses.get(ip, 0) | IP_ADDRESS_WHITELISTED
+
+        values.update(
+            AXES_IP_WHITELIST=ip_whitelist,
+            AXES_IP_BLACKLIST=ip_blacklist,
+            AXES_IP_WHITELIST_NETWORKS=IPNetworkSet(ip for ip in ip_whitelist if '/' in ip),
+            AXES_IP_BLACKLIST_NETWORKS=IPNetworkSet(ip for ip in ip_blacklist if '/' in ip),
+            AXES_IP_STATUSES=ip_statuses,
+            AXES_PASSWORD_FORM_FIELDS=frozenset(('password', values['AXES_PASSWORD_FORM_FIELD'])),
+        )
+
+        for name, value in values.items():
+            setattr(self, name, value)
+
+
+snapshot = AxesSettingsSnapshot()
+
+
+def handle_setting_changed(sender, setting, value, enter, **kwargs):  # pylint: disable=unused-argument
+    """
+    Refresh the settings snapshot if an Axes setting changes
+    in e.g. application reconfiguration or during testing.
+    """
+
+    if setting.startswith('AXES_'):
+        snapshot.reload()
+
+
+setting_changed.connect(handle_setting_changed, dispatch_uid='axes.conf.handle_setting_changed')
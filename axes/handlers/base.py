@@ -1,5 +1,7 @@
-from axes.conf import settings
+from axes.conf import snapshot
 from axes.helpers import (
+    AccessDecision,
+    get_client_access_decision,
     is_client_ip_address_blacklisted,
     is_client_ip_address_whitelisted,
     is_client_method_whitelisted,
@@ -31,8 +33,23 @@ class AxesHandler:  # pylint: disable=unused-argument
 
         Please refer to the ``axes.handlers.database.AxesDatabaseHandler`` for the default implementation
         and inspiration on some common checks and access restrictions before writing your own implementation.
+
+        Handlers that do not override ``is_blacklisted`` or ``is_whitelisted`` run the default checks
+        in a single pass with ``axes.helpers.get_client_access_decision``.
         """
 
+        handler_class = type(self)
+        uses_default_access_checks = (
+            handler_class.is_blacklisted is AxesHandler.is_blacklisted
+            and handler_class.is_whitelisted is AxesHandler.is_whitelisted
+        )
+
+        if uses_default_access_checks:
+            decision = get_client_access_decision(request)
+            if decision is AccessDecision.CHECK_LOCK:
+                return not self.is_locked(request, credentials)
+            return decision is AccessDecision.ALLOW
+
         if self.is_blacklisted(request, credentials):
             return False
 
@@ -84,10 +101,10 @@ class AxesHandler:  # pylint: disable=unused-argument
         Checks if the request or given credentials are whitelisted for access.
         """
 
-        if is_client_ip_address_whitelisted(request):
+        if is_client_method_whitelisted(request):
             return True
 
-        if is_client_method_whitelisted(request):
+        if is_client_ip_address_whitelisted(request):
             return True
 
         return False
@@ -97,8 +114,8 @@ class AxesHandler:  # pylint: disable=unused-argument
         Checks if the request or given credentials are locked.
         """
 
-        if settings.AXES_LOCK_OUT_AT_FAILURE:
-            return self.get_failures(request, credentials) >= settings.AXES_FAILURE_LIMIT
+        if snapshot.AXES_LOCK_OUT_AT_FAILURE:
+            return self.get_failures(request, credentials) >= snapshot.AXES_FAILURE_LIMIT
 
         return False
 
@@ -108,6 +125,11 @@ class AxesHandler:  # pylint: disable=unused-argument
 
         This is a virtual method that needs an implementation in the handler subclass
         if the ``settings.AXES_LOCK_OUT_AT_FAILURE`` flag is set to ``True``.
+
+        The method is called for every request that is checked for a lockout and should
+        read the failure count with a single lookup, e.g. one cache get or database query.
+        Implementations that also record failures should increment the count atomically,
+        e.g. with ``cache.incr``, instead of reading, incrementing, and writing it back.
         """
 
         raise NotImplementedError('The Axes handler class needs a method definition for get_failures')
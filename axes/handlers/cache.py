@@ -1,6 +1,6 @@
 from logging import getLogger
 
-from axes.conf import settings
+from axes.conf import settings, snapshot
 from axes.handlers.base import AxesHandler
 from axes.signals import user_locked_out
 from axes.helpers import (
@@ -28,6 +28,35 @@ class AxesCacheHandler(AxesHandler):  # pylint: disable=too-many-locals
         cache_key = get_client_cache_key(request, credentials)
         return self.cache.get(cache_key, default=0)
 
+    def record_failure(self, request, credentials: dict = None) -> int:
+        """
+        Increment the number of failures associated to the given request and credentials and return the new number.
+
+        The counter is created with ``cache.add`` and incremented with ``cache.incr`` which map to atomic
+        operations in e.g. Memcached and Redis, so that concurrent failures are not lost between a get and a set.
+        """
+
+        cache_key = get_client_cache_key(request, credentials)
+
+        if self.cache.add(cache_key, 1, self.cache_timeout):
+            return 1
+
+        try:
+            failures_since_start = self.cache.incr(cache_key)
+        except ValueError:
+            # The counter expired between the add and incr calls
+            self.cache.set(cache_key, 1, self.cache_timeout)
+            return 1
+
+        # Count the cool off from the latest failure like the database handler does
+        try:
+            self.cache.touch(cache_key, self.cache_timeout)
+        except (AttributeError, NotImplementedError):
+            # Django 1.11 and some third party cache backends do not implement touch
+            self.cache.set(cache_key, failures_since_start, self.cache_timeout)
+
+        return failures_since_start
+
     def user_login_failed(
             self,
             sender,
@@ -52,14 +81,14 @@ class AxesCacheHandler(AxesHandler):  # pylint: disable=too-many-locals
             log.info('AXES: Login failed from whitelisted client %s.', client_str)
             return
 
-        failures_since_start = 1 + self.get_failures(request, credentials)
+        failures_since_start = self.record_failure(request, credentials)
 
         if failures_since_start > 1:
             log.warning(
                 'AXES: Repeated login failure by %s. Count = %d of %d. Updating existing record in the cache.',
                 client_str,
                 failures_since_start,
-                settings.AXES_FAILURE_LIMIT,
+                snapshot.AXES_FAILURE_LIMIT,
             )
         else:
             log.warning(
@@ -67,10 +96,7 @@ class AxesCacheHandler(AxesHandler):  # pylint: disable=too-many-locals
                 client_str,
             )
 
-        cache_key = get_client_cache_key(request, credentials)
-        self.cache.set(cache_key, failures_since_start, self.cache_timeout)
-
-        if settings.AXES_LOCK_OUT_AT_FAILURE and failures_since_start >= settings.AXES_FAILURE_LIMIT:
+        if snapshot.AXES_LOCK_OUT_AT_FAILURE and failures_since_start >= snapshot.AXES_FAILURE_LIMIT:
             log.warning('AXES: Locking out %s after repeated login failures.', client_str)
 
             request.axes_locked_out = True
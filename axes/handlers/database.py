@@ -1,4 +1,5 @@
 from logging import getLogger
+from typing import Optional
 
 from django.db.models import Max, Value
 from django.db.models.functions import Concat
@@ -9,11 +10,14 @@ from axes.attempts import (
     is_user_attempt_whitelisted,
     reset_user_attempts,
 )
-from axes.conf import settings
+from axes.conf import settings, snapshot
 from axes.handlers.base import AxesHandler
 from axes.models import AccessLog, AccessAttempt
 from axes.signals import user_locked_out
 from axes.helpers import (
+    get_cache,
+    get_cache_timeout,
+    get_client_cache_key,
     get_client_str,
     get_client_username,
     get_credentials,
@@ -31,9 +35,39 @@ class AxesDatabaseHandler(AxesHandler):  # pylint: disable=too-many-locals
 
     def get_failures(self, request, credentials: dict = None) -> int:
         attempts = get_user_attempts(request, credentials)
-        return attempts.aggregate(Max('failures_since_start'))['failures_since_start__max'] or 0
+        failures = attempts.aggregate(Max('failures_since_start'))['failures_since_start__max'] or 0
+
+        if snapshot.AXES_CACHE_FAILURES:
+            # Only fill the cache here, because a count that is recorded concurrently
+            # by user_login_failed must not be overwritten with the stale count read above
+            self.add_cached_failures(get_client_cache_key(request, credentials), failures)
+
+        return failures
+
+    def get_cached_failures(self, cache_key: str) -> Optional[int]:
+        """
+        Get the failure count cached for the given client cache key or None if the count is not cached.
+        """
+
+        return get_cache().get(cache_key)
+
+    def add_cached_failures(self, cache_key: str, failures: int):
+        get_cache().add(cache_key, failures, get_cache_timeout())
+
+    def set_cached_failures(self, cache_key: str, failures: int):
+        get_cache().set(cache_key, failures, get_cache_timeout())
+
+    def delete_cached_failures(self, cache_key: str):
+        get_cache().delete(cache_key)
 
     def is_locked(self, request, credentials: dict = None):
+        if snapshot.AXES_CACHE_FAILURES and snapshot.AXES_LOCK_OUT_AT_FAILURE:
+            # Cached counts are only trusted for clients below the failure limit
+            # and possible lockouts are always checked against the database
+            failures = self.get_cached_failures(get_client_cache_key(request, credentials))
+            if failures is not None and failures < snapshot.AXES_FAILURE_LIMIT:
+                return False
+
         if is_user_attempt_whitelisted(request, credentials):
             return False
 
@@ -82,7 +116,7 @@ class AxesDatabaseHandler(AxesHandler):  # pylint: disable=too-many-locals
                 'AXES: Repeated login failure by %s. Count = %d of %d. Updating existing record in the database.',
                 client_str,
                 failures_since_start,
-                settings.AXES_FAILURE_LIMIT,
+                snapshot.AXES_FAILURE_LIMIT,
             )
 
             separator = '\n---------\n'
@@ -118,7 +152,10 @@ class AxesDatabaseHandler(AxesHandler):  # pylint: disable=too-many-locals
                 attempt_time=request.axes_attempt_time,
             )
 
-        if settings.AXES_LOCK_OUT_AT_FAILURE and failures_since_start >= settings.AXES_FAILURE_LIMIT:
+        if snapshot.AXES_CACHE_FAILURES:
+            self.set_cached_failures(get_client_cache_key(request, credentials), failures_since_start)
+
+        if snapshot.AXES_LOCK_OUT_AT_FAILURE and failures_since_start >= snapshot.AXES_FAILURE_LIMIT:
             log.warning('AXES: Locking out %s after repeated login failures.', client_str)
 
             request.axes_locked_out = True
@@ -181,3 +218,19 @@ class AxesDatabaseHandler(AxesHandler):  # pylint: disable=too-many-locals
             ).update(
                 logout_time=request.axes_attempt_time,
             )
+
+    def post_save_access_attempt(self, instance, **kwargs):
+        """
+        Invalidate the cached failure count for the client of the saved AccessAttempt.
+        """
+
+        if snapshot.AXES_CACHE_FAILURES:
+            self.delete_cached_failures(get_client_cache_key(instance))
+
+    def post_delete_access_attempt(self, instance, **kwargs):
+        """
+        Invalidate the cached failure count for the client of the deleted AccessAttempt.
+        """
+
+        if snapshot.AXES_CACHE_FAILURES:
+            self.delete_cached_failures(get_client_cache_key(instance))
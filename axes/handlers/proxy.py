@@ -3,13 +3,16 @@ from logging import getLogger
 from django.utils.module_loading import import_string
 from django.utils.timezone import now
 
-from axes.conf import settings
+from axes.conf import settings, snapshot
 from axes.handlers.base import AxesHandler
 from axes.helpers import (
+    get_cache,
+    get_client_allowed_cache_key,
     get_client_ip_address,
     get_client_user_agent,
     get_client_path_info,
     get_client_http_accept,
+    get_credentials,
     toggleable,
 )
 
@@ -66,20 +69,68 @@ class AxesProxyHandler(AxesHandler):
 
     @classmethod
     def is_allowed(cls, request, credentials: dict = None) -> bool:
+        """
+        Check if the request is allowed with the configured handler implementation.
+
+        If ``settings.AXES_ALLOWED_CACHE_TIMEOUT`` is set, the decision is memoized in the Axes cache
+        for repeated requests by the same client. Allowed decisions are discarded when the client logs in
+        or fails to log in, and denied decisions are discarded when the client logs in.
+        """
+
         cls.update_request(request)
-        return cls.get_implementation().is_allowed(request, credentials)
+
+        timeout = snapshot.AXES_ALLOWED_CACHE_TIMEOUT
+        if not timeout:
+            return cls.get_implementation().is_allowed(request, credentials)
+
+        cache = get_cache()
+        cache_key = get_client_allowed_cache_key(request, credentials)
+
+        allowed = cache.get(cache_key)
+        if allowed is None:
+            allowed = bool(cls.get_implementation().is_allowed(request, credentials))
+            cache.set(cache_key, allowed, timeout)
+
+        return allowed
+
+    @staticmethod
+    def reset_allowed_cache(request, credentials: dict = None, keep_denied: bool = False):
+        """
+        Discard the memoized access decision of the given request and credentials if decisions are memoized.
+
+        Denied decisions are kept if ``keep_denied`` is ``True``.
+        """
+
+        if request is None or not snapshot.AXES_ALLOWED_CACHE_TIMEOUT:
+            return
+
+        cache = get_cache()
+        cache_key = get_client_allowed_cache_key(request, credentials)
+
+        if keep_denied and cache.get(cache_key) is False:
+            return
+
+        cache.delete(cache_key)
 
     @classmethod
     @toggleable
     def user_login_failed(cls, sender, credentials: dict, request=None, **kwargs):
         cls.update_request(request)
-        return cls.get_implementation().user_login_failed(sender, credentials, request, **kwargs)
+        try:
+            return cls.get_implementation().user_login_failed(sender, credentials, request, **kwargs)
+        finally:
+            # Failures only push locked out clients further past the failure limit
+            # so denied decisions stay valid and are kept for the following requests
+            cls.reset_allowed_cache(request, credentials, keep_denied=True)
 
     @classmethod
     @toggleable
     def user_logged_in(cls, sender, request, user, **kwargs):
         cls.update_request(request)
-        return cls.get_implementation().user_logged_in(sender, request, user, **kwargs)
+        try:
+            return cls.get_implementation().user_logged_in(sender, request, user, **kwargs)
+        finally:
+            cls.reset_allowed_cache(request, get_credentials(user.get_username()))
 
     @classmethod
     @toggleable
@@ -1,16 +1,20 @@
 from datetime import timedelta
-from hashlib import md5
+from enum import Enum
+from functools import lru_cache, wraps
+from hashlib import blake2b
 from logging import getLogger
 from typing import Any, Callable, Optional, Type, Union
 
 from django.core.cache import caches, BaseCache
+from django.core.signals import setting_changed
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse, QueryDict
 from django.shortcuts import render
 from django.utils.module_loading import import_string
 
 import ipware.ip2
+import ipware.utils
 
-from axes.conf import settings
+from axes.conf import IP_ADDRESS_BLACKLISTED, IP_ADDRESS_WHITELISTED, settings, snapshot
 
 log = getLogger(__name__)
 
@@ -60,9 +64,12 @@ def get_cool_off() -> Optional[timedelta]:
     return cool_off
 
 
+@lru_cache(maxsize=8)
 def get_cool_off_iso8601(delta: timedelta) -> str:
     """
     Return datetime.timedelta translated to ISO 8601 formatted duration for use in e.g. cool offs.
+
+    The results are memoized because the function is called with the configured cool off on every lockout.
     """
 
     seconds = delta.total_seconds()
@@ -96,9 +103,34 @@ def get_credentials(username: str = None, **kwargs) -> dict:
     and update the credentials dictionary with the kwargs given on top of that.
     """
 
-    credentials = {settings.AXES_USERNAME_FORM_FIELD: username}
-    credentials.update(kwargs)
-    return credentials
+    return {snapshot.AXES_USERNAME_FORM_FIELD: username, **kwargs}
+
+
+_username_callable = None
+
+
+def get_username_callable() -> Callable:
+    """
+    Resolve ``settings.AXES_USERNAME_CALLABLE`` into a callable.
+
+    Import paths are resolved with ``import_string`` on first use and memoized until Axes settings change.
+
+    :exception TypeError: if settings.AXES_USERNAME_CALLABLE is not a string or a callable.
+    """
+
+    global _username_callable  # pylint: disable=global-statement
+
+    if _username_callable is None:
+        username_callable = snapshot.AXES_USERNAME_CALLABLE
+
+        if isinstance(username_callable, str):
+            username_callable = import_string(username_callable)
+        elif not callable(username_callable):
+            raise TypeError('settings.AXES_USERNAME_CALLABLE needs to be a string, callable, or None.')
+
+        _username_callable = username_callable
+
+    return _username_callable
 
 
 def get_client_username(request, credentials: dict = None) -> str:
@@ -115,43 +147,116 @@ def get_client_username(request, credentials: dict = None) -> str:
     :param credentials: incoming credentials ``dict`` or similar object from authentication backend or other source
     """
 
-    if settings.AXES_USERNAME_CALLABLE:
+    if snapshot.AXES_USERNAME_CALLABLE:
         log.debug('Using settings.AXES_USERNAME_CALLABLE to get username')
+        return get_username_callable()(request, credentials)
 
-        if callable(settings.AXES_USERNAME_CALLABLE):
-            return settings.AXES_USERNAME_CALLABLE(request, credentials)
-        if isinstance(settings.AXES_USERNAME_CALLABLE, str):
-            return import_string(settings.AXES_USERNAME_CALLABLE)(request, credentials)
-        raise TypeError('settings.AXES_USERNAME_CALLABLE needs to be a string, callable, or None.')
+    username_form_field = snapshot.AXES_USERNAME_FORM_FIELD
 
     if credentials:
         log.debug('Using parameter credentials to get username with key settings.AXES_USERNAME_FORM_FIELD')
-        return credentials.get(settings.AXES_USERNAME_FORM_FIELD, None)
+        return credentials.get(username_form_field, None)
 
     log.debug('Using parameter request.POST to get username with key settings.AXES_USERNAME_FORM_FIELD')
-    return request.POST.get(settings.AXES_USERNAME_FORM_FIELD, None)
+    return request.POST.get(username_form_field, None)
 
 
-def get_client_ip_address(request) -> str:
+def get_client_ip_address(request) -> Optional[str]:
     """
     Get client IP address as configured by the user.
 
     The django-ipware package is used for address resolution
     and parameters can be configured in the Axes package.
+
+    The address is memoized in ``request.axes_ip_address`` by the Axes handlers
+    and the memoized value is returned without parsing the request headers again.
     """
 
+    if hasattr(request, 'axes_ip_address'):
+        return request.axes_ip_address
+
+    if _client_ip_address_header is not None:
+        return get_client_ip_address_from_header(request, _client_ip_address_header)
+
     client_ip_address, _ = ipware.ip2.get_client_ip(
         request,
-        proxy_order=settings.AXES_PROXY_ORDER,
-        proxy_count=settings.AXES_PROXY_COUNT,
-        proxy_trusted_ips=settings.AXES_PROXY_TRUSTED_IPS,
-        request_header_order=settings.AXES_META_PRECEDENCE_ORDER,
+        proxy_order=snapshot.AXES_PROXY_ORDER,
+        proxy_count=snapshot.AXES_PROXY_COUNT,
+        proxy_trusted_ips=snapshot.AXES_PROXY_TRUSTED_IPS,
+        request_header_order=snapshot.AXES_META_PRECEDENCE_ORDER,
     )
 
     return client_ip_address
 
 
+# Length of the longest textual IP address, e.g. ``ffff:ffff:ffff:ffff:ffff:ffff:255.255.255.255``
+IP_ADDRESS_MAX_LENGTH = 45
+
+
+@lru_cache(maxsize=1024)
+def _is_valid_ip_address(ip_address: str) -> bool:
+    return ipware.utils.is_valid_ip(ip_address)
+
+
+def is_valid_ip_address(ip_address: str) -> bool:
+    """
+    Check if the given string is a valid IP address and memoize the results for strings no longer than an IP address.
+    """
+
+    if len(ip_address) > IP_ADDRESS_MAX_LENGTH:
+        return ipware.utils.is_valid_ip(ip_address)
+
+    return _is_valid_ip_address(ip_address)
+
+
+def get_client_ip_address_from_header(request, header: str) -> Optional[str]:
+    """
+    Get client IP address from a single ``request.META`` header without proxy count or trusted proxy checks.
+
+    This returns the same address as the django-ipware resolver does when it is configured with only one header
+    and without ``AXES_PROXY_COUNT`` or ``AXES_PROXY_TRUSTED_IPS``, but skips its generic header processing.
+    """
+
+    meta = request.META
+    value = meta.get(header, meta.get(header.replace('_', '-'), '')).strip()
+
+    ip_addresses = [ip_address.strip().lower() for ip_address in value.split(',')]
+    ip_addresses = [ip_address for ip_address in ip_addresses if ip_address]
+    if not ip_addresses:
+        return None
+
+    # django-ipware discards the header unless both the left-most and the right-most addresses are valid
+    if not (is_valid_ip_address(ip_addresses[0]) and is_valid_ip_address(ip_addresses[-1])):
+        return None
+
+    if snapshot.AXES_PROXY_ORDER == 'right-most':
+        return ip_addresses[-1]
+    return ip_addresses[0]
+
+
+def get_client_ip_address_header() -> Optional[str]:
+    """
+    Get the single header that client IP addresses can be read from without django-ipware for the current settings.
+
+    Returns None if the proxy configuration needs the full django-ipware resolver.
+    """
+
+    if snapshot.AXES_PROXY_COUNT is not None or snapshot.AXES_PROXY_TRUSTED_IPS:
+        return None
+
+    if len(snapshot.AXES_META_PRECEDENCE_ORDER) != 1:
+        return None
+
+    return snapshot.AXES_META_PRECEDENCE_ORDER[0]
+
+
+_client_ip_address_header = get_client_ip_address_header()
+
+
 def get_client_user_agent(request) -> str:
+    if hasattr(request, 'axes_user_agent'):
+        return request.axes_user_agent
+
     return request.META.get('HTTP_USER_AGENT', '<unknown>')[:255]
 
 
@@ -173,11 +278,11 @@ def get_client_parameters(username: str, ip_address: str, user_agent: str) -> di
 
     filter_kwargs = dict()
 
-    if settings.AXES_ONLY_USER_FAILURES:
+    if snapshot.AXES_ONLY_USER_FAILURES:
         # 1. Only individual usernames can be tracked with parametrization
         filter_kwargs['username'] = username
     else:
-        if settings.AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP:
+        if snapshot.AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP:
             # 2. A combination of username and IP address can be used as well
             filter_kwargs['username'] = username
             filter_kwargs['ip_address'] = ip_address
@@ -185,50 +290,55 @@ def get_client_parameters(username: str, ip_address: str, user_agent: str) -> di
             # 3. Default case is to track the IP address only, which is the most secure option
             filter_kwargs['ip_address'] = ip_address
 
-        if settings.AXES_USE_USER_AGENT:
+        if snapshot.AXES_USE_USER_AGENT:
             # 4. The HTTP User-Agent can be used to track e.g. one browser
             filter_kwargs['user_agent'] = user_agent
 
     return filter_kwargs
 
 
-def get_client_str(username: str, ip_address: str, user_agent: str, path_info: str) -> str:
+def get_client_str_template() -> str:
     """
-    Get a readable string that can be used in e.g. logging to distinguish client requests.
+    Build the ``str.format`` template used by ``get_client_str`` for the current settings.
 
-    Example log format would be ``{username: "example", ip_address: "127.0.0.1", path_info: "/example/"}``
+    Example template would be ``{{username: "{username}", ip_address: "{ip_address}", path_info: "{path_info}"}}``
     """
 
-    client_dict = dict()
-
-    if settings.AXES_VERBOSE:
+    if snapshot.AXES_VERBOSE:
         # Verbose mode logs every attribute that is available
-        client_dict['username'] = username
-        client_dict['ip_address'] = ip_address
-        client_dict['user_agent'] = user_agent
+        keys = ['username', 'ip_address', 'user_agent']
     else:
-        # Other modes initialize the attributes that are used for the actual lockouts
-        client_dict = get_client_parameters(username, ip_address, user_agent)
+        # Other modes include the attributes that are used for the actual lockouts
+        keys = list(get_client_parameters('', '', ''))
 
     # Path info is always included as last component in the client string for traceability purposes
+    keys.append('path_info')
+
+    # Template the keys into a readable and concatenated key: "value" format
+    # wrapped in a single {key: "value"} bracing which needs double braces in the template
+    return '{{' + ', '.join(f'{key}: "{{{key}}}"' for key in keys) + '}}'
+
+
+_client_str_template = get_client_str_template()
+
+
+def get_client_str(username: str, ip_address: str, user_agent: str, path_info: str) -> str:
+    """
+    Get a readable string that can be used in e.g. logging to distinguish client requests.
+
+    Example log format would be ``{username: "example", ip_address: "127.0.0.1", path_info: "/example/"}``
+    """
+
     if path_info and isinstance(path_info, (tuple, list)):
         path_info = path_info[0]
-    client_dict['path_info'] = path_info
 
-    # Template the internal dictionary representation into a readable and concatenated key: "value" format
-    template = ', '.join(
-        f'{key}: "{value}"'
-        for key, value
-        in client_dict.items()
+    return _client_str_template.format(
+        username=username,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        path_info=path_info,
     )
 
-    # Wrap the internal dict into a single {key: "value"} bracing in the output
-    # which requires double braces when done with the Python string templating system
-    # i.e. {{key: "value"}} becomes {key: "value"} when run through a .format() call
-    template = '{{' + template + '}}'
-
-    return template.format(client_dict)
-
 
 def get_query_str(query: Type[QueryDict], max_length: int = 1024) -> str:
     """
@@ -239,17 +349,24 @@ def get_query_str(query: Type[QueryDict], max_length: int = 1024) -> str:
     The length of the output is limited to max_length to avoid a DoS attack via excessively large payloads.
     """
 
-    query_dict = query.copy()
-    query_dict.pop('password', None)
-    query_dict.pop(settings.AXES_PASSWORD_FORM_FIELD, None)
+    excluded_keys = snapshot.AXES_PASSWORD_FORM_FIELDS
 
-    query_str = '\n'.join(
-        f'{key}={value}'
-        for key, value
-        in query_dict.items()
-    )
+    # Collect the key-value pairs without copying the query and stop once the output is long enough
+    query_parts = []
+    query_length = 0
+
+    for key, value in query.items():
+        if key in excluded_keys:
+            continue
+
+        query_part = f'{key}={value}'
+        query_parts.append(query_part)
+        query_length += len(query_part) + 1  # account for the separating newline
 
-    return query_str[:max_length]
+        if query_length > max_length:
+            break
+
+    return '\n'.join(query_parts)[:max_length]
 
 
 def get_lockout_message() -> str:
@@ -258,8 +375,11 @@ def get_lockout_message() -> str:
     return settings.AXES_PERMALOCK_MESSAGE
 
 
-def get_lockout_response(request, credentials: dict = None) -> HttpResponse:
-    status = 403
+def get_lockout_context(request, credentials: dict = None) -> dict:
+    """
+    Get the context for the JSON and template lockout responses.
+    """
+
     context = {
         'failure_limit': settings.AXES_FAILURE_LIMIT,
         'username': get_client_username(request, credentials) or ''
@@ -271,9 +391,22 @@ def get_lockout_response(request, credentials: dict = None) -> HttpResponse:
             'cooloff_time': get_cool_off_iso8601(cool_off),  # differing old name is kept for backwards compatibility
         })
 
+    return context
+
+
+def get_lockout_response(request, credentials: dict = None) -> HttpResponse:
+    """
+    Get the response for a locked out request.
+
+    The context is only calculated for the JSON and template responses
+    as the redirect and plain message responses do not use it.
+    """
+
+    status = 403
+
     if request.is_ajax():
         return JsonResponse(
-            context,
+            get_lockout_context(request, credentials),
             status=status,
         )
 
@@ -281,7 +414,7 @@ def get_lockout_response(request, credentials: dict = None) -> HttpResponse:
         return render(
             request,
             settings.AXES_LOCKOUT_TEMPLATE,
-            context,
+            get_lockout_context(request, credentials),
             status=status,
         )
 
@@ -297,17 +430,36 @@ def get_lockout_response(request, credentials: dict = None) -> HttpResponse:
 
 
 def is_ip_address_in_whitelist(ip_address: str) -> bool:
-    if not settings.AXES_IP_WHITELIST:
-        return False
+    if ip_address in snapshot.AXES_IP_WHITELIST:
+        return True
 
-    return ip_address in settings.AXES_IP_WHITELIST
+    return ip_address in snapshot.AXES_IP_WHITELIST_NETWORKS
 
 
 def is_ip_address_in_blacklist(ip_address: str) -> bool:
-    if not settings.AXES_IP_BLACKLIST:
-        return False
+    if ip_address in snapshot.AXES_IP_BLACKLIST:
+        return True
+
+    return ip_address in snapshot.AXES_IP_BLACKLIST_NETWORKS
 
-    return ip_address in settings.AXES_IP_BLACKLIST
+
+def get_ip_address_status(ip_address: str) -> int:
+    """
+    Get the IP blacklist and whitelist status of the given IP address with a single lookup for plain addresses.
+
+    The status is a combination of the ``axes.conf.IP_ADDRESS_BLACKLISTED``
+    and ``axes.conf.IP_ADDRESS_WHITELISTED`` bit flags.
+    """
+
+    status = snapshot.AXES_IP_STATUSES.get(ip_address, 0)
+
+    if snapshot.AXES_IP_BLACKLIST_NETWORKS and ip_address in snapshot.AXES_IP_BLACKLIST_NETWORKS:
+        status |= IP_ADDRESS_BLACKLISTED
+
+    if snapshot.AXES_IP_WHITELIST_NETWORKS and ip_address in snapshot.AXES_IP_WHITELIST_NETWORKS:
+        status |= IP_ADDRESS_WHITELISTED
+
+    return status
 
 
 def is_client_ip_address_whitelisted(request):
@@ -315,11 +467,8 @@ def is_client_ip_address_whitelisted(request):
     Check if the given request refers to a whitelisted IP.
     """
 
-    if settings.AXES_NEVER_LOCKOUT_WHITELIST and is_ip_address_in_whitelist(request.axes_ip_address):
-        return True
-
-    if settings.AXES_ONLY_WHITELIST and is_ip_address_in_whitelist(request.axes_ip_address):
-        return True
+    if snapshot.AXES_NEVER_LOCKOUT_WHITELIST or snapshot.AXES_ONLY_WHITELIST:
+        return bool(get_ip_address_status(request.axes_ip_address) & IP_ADDRESS_WHITELISTED)
 
     return False
 
@@ -329,13 +478,7 @@ def is_client_ip_address_blacklisted(request) -> bool:
     Check if the given request refers to a blacklisted IP.
     """
 
-    if is_ip_address_in_blacklist(request.axes_ip_address):
-        return True
-
-    if settings.AXES_ONLY_WHITELIST and not is_ip_address_in_whitelist(request.axes_ip_address):
-        return True
-
-    return False
+    return get_client_access_decision(request, check_method=False) is AccessDecision.DENY
 
 
 def is_client_method_whitelisted(request) -> bool:
@@ -343,10 +486,90 @@ def is_client_method_whitelisted(request) -> bool:
     Check if the given request uses a whitelisted method.
     """
 
-    if settings.AXES_NEVER_LOCKOUT_GET and request.method == 'GET':
-        return True
+    return request.method == 'GET' and snapshot.AXES_NEVER_LOCKOUT_GET
 
-    return False
+
+class AccessDecision(Enum):
+    """
+    Outcome of the IP address and request method checks for a request.
+    """
+
+    ALLOW = 'allow'
+    DENY = 'deny'
+    CHECK_LOCK = 'check_lock'
+
+
+def get_client_access_decision(request, check_method: bool = True) -> AccessDecision:
+    """
+    Check the given request against the IP blacklist, IP whitelist, and method whitelist in one pass.
+
+    Returns ``AccessDecision.DENY`` if the IP address is blacklisted, or not whitelisted with ``AXES_ONLY_WHITELIST``,
+    ``AccessDecision.ALLOW`` if the IP address is whitelisted or ``is_client_method_whitelisted`` returns ``True``,
+    and ``AccessDecision.CHECK_LOCK`` if the lockout status decides the access.
+
+    The method whitelist is skipped if ``check_method`` is ``False``.
+    """
+
+    status = get_ip_address_status(request.axes_ip_address)
+
+    if status & IP_ADDRESS_BLACKLISTED:
+        return AccessDecision.DENY
+
+    only_whitelist = snapshot.AXES_ONLY_WHITELIST
+    in_whitelist = False
+
+    if only_whitelist or snapshot.AXES_NEVER_LOCKOUT_WHITELIST:
+        in_whitelist = bool(status & IP_ADDRESS_WHITELISTED)
+
+        if only_whitelist and not in_whitelist:
+            return AccessDecision.DENY
+
+    if in_whitelist or (check_method and request.method == 'GET' and snapshot.AXES_NEVER_LOCKOUT_GET):
+        return AccessDecision.ALLOW
+
+    return AccessDecision.CHECK_LOCK
+
+
+def _cache_key_components_username(username, ip_address, user_agent):  # pylint: disable=unused-argument
+    return username or ''
+
+
+def _cache_key_components_ip_address(username, ip_address, user_agent):  # pylint: disable=unused-argument
+    return ip_address or ''
+
+
+def _cache_key_components_username_ip_address(username, ip_address, user_agent):  # pylint: disable=unused-argument
+    return (username or '') + (ip_address or '')
+
+
+def _cache_key_components_ip_address_user_agent(username, ip_address, user_agent):  # pylint: disable=unused-argument
+    return (ip_address or '') + (user_agent or '')
+
+
+def _cache_key_components_username_ip_address_user_agent(username, ip_address, user_agent):
+    return (username or '') + (ip_address or '') + (user_agent or '')
+
+
+def get_cache_key_components_function() -> Callable[[Optional[str], Optional[str], Optional[str]], str]:
+    """
+    Select the function that concatenates client cache key components for the current settings.
+
+    The selected function returns the same value as concatenating the non-empty values
+    of ``get_client_parameters`` but does not branch on settings or allocate a dict per call.
+    """
+
+    if snapshot.AXES_ONLY_USER_FAILURES:
+        return _cache_key_components_username
+
+    return {
+        (False, False): _cache_key_components_ip_address,
+        (True, False): _cache_key_components_username_ip_address,
+        (False, True): _cache_key_components_ip_address_user_agent,
+        (True, True): _cache_key_components_username_ip_address_user_agent,
+    }[(bool(snapshot.AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP), bool(snapshot.AXES_USE_USER_AGENT))]
+
+
+_cache_key_components = get_cache_key_components_function()
 
 
 def get_client_cache_key(request_or_attempt: Union[HttpRequest, Any], credentials: dict = None) -> str:
@@ -367,15 +590,33 @@ def get_client_cache_key(request_or_attempt: Union[HttpRequest, Any], credential
         ip_address = request_or_attempt.ip_address
         user_agent = request_or_attempt.user_agent
 
-    filter_kwargs = get_client_parameters(username, ip_address, user_agent)
-
-    cache_key_components = ''.join(value for value in filter_kwargs.values() if value)
-    cache_key_digest = md5(cache_key_components.encode()).hexdigest()
+    cache_key_components = _cache_key_components(username, ip_address, user_agent)
+    cache_key_digest = blake2b(cache_key_components.encode(), digest_size=16).hexdigest()
     cache_key = f'axes-{cache_key_digest}'
 
     return cache_key
 
 
+def get_client_allowed_cache_key(request, credentials: dict = None) -> str:
+    """
+    Build cache key name for the memoized access decision of the given request and credentials.
+
+    Unlike ``get_client_cache_key`` the key always covers the username, IP address, user agent, and request method,
+    because the whitelists, blacklists, and user specific lockout exemptions apply to the individual clients.
+    """
+
+    cache_key_components = '\n'.join((
+        str(get_client_username(request, credentials) or ''),
+        get_client_ip_address(request) or '',
+        get_client_user_agent(request) or '',
+        request.method or '',
+    ))
+    cache_key_digest = blake2b(cache_key_components.encode(), digest_size=16).hexdigest()
+    cache_key = f'axes-allowed-{cache_key_digest}'
+
+    return cache_key
+
+
 def toggleable(func) -> Callable:
     """
     Decorator that toggles function execution based on settings.
@@ -385,9 +626,33 @@ def toggleable(func) -> Callable:
 
     This decorator is only suitable for functions that do not
     require return values to be passed back to callers.
+
+    The flag is read from the settings snapshot on every call instead of being bound at decoration time
+    so that toggling ``settings.AXES_ENABLED`` at runtime, e.g. with ``override_settings``, takes effect.
     """
 
+    @wraps(func)
     def inner(*args, **kwargs):  # pylint: disable=inconsistent-return-statements
-        if settings.AXES_ENABLED:
+        if snapshot.AXES_ENABLED:
             return func(*args, **kwargs)
     return inner
+
+
+def handle_setting_changed(sender, setting, value, enter, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuild the helpers that are specialized for the current settings if an Axes setting changes.
+
+    This receiver is connected after the ``axes.conf`` receiver and so sees the refreshed settings snapshot.
+    """
+
+    global _cache_key_components, _client_ip_address_header, _client_str_template  # pylint: disable=global-statement
+    global _username_callable  # pylint: disable=global-statement
+
+    if setting.startswith('AXES_'):
+        _cache_key_components = get_cache_key_components_function()
+        _client_str_template = get_client_str_template()
+        _client_ip_address_header = get_client_ip_address_header()
+        _username_callable = None
+
+
+setting_changed.connect(handle_setting_changed, dispatch_uid='axes.helpers.handle_setting_changed')
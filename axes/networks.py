@@ -0,0 +1,67 @@
+from ipaddress import ip_address, ip_network
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import pytricia
+except ImportError:  # pragma: no cover
+    pytricia = None
+
+
+class IPNetworkSet:
+    """
+    Set of IP networks that supports membership checks for IP address strings.
+
+    Networks are given in CIDR notation such as ``'10.0.0.0/8'`` or ``'2001:db8::/32'``
+    and an IP address is a member of the set if it belongs to any of the networks.
+
+    If the optional ``pytricia`` package is installed, the networks are stored in PATRICIA tries.
+    Otherwise the network addresses are bucketed by netmask and every lookup does one set lookup
+    per distinct prefix length instead of comparing the address against every network.
+    """
+
+    def __init__(self, networks: Iterable[str] = (), use_pytricia: bool = True):
+        self.networks = tuple(ip_network(network, strict=False) for network in networks)
+        self.tries = None  # type: Optional[Dict[int, Any]]
+        self.buckets = None  # type: Optional[Dict[int, Tuple[Tuple[int, frozenset], ...]]]
+
+        if use_pytricia and pytricia is not None:
+            self.tries = {4: pytricia.PyTricia(32), 6: pytricia.PyTricia(128)}
+            for network in self.networks:
+                self.tries[network.version].insert(network.with_prefixlen, True)
+        else:
+            buckets = {4: {}, 6: {}}  # type: Dict[int, Dict[int, Set[int]]]
+            for network in self.networks:
+                netmask = int(network.netmask)
+                buckets[network.version].setdefault(netmask, set()).add(int(network.network_address))
+
+            self.buckets = {
+                version: tuple(
+                    (netmask, frozenset(network_addresses))
+                    for netmask, network_addresses
+                    in sorted(version_buckets.items(), reverse=True)
+                )
+                for version, version_buckets
+                in buckets.items()
+            }
+
+    def __bool__(self) -> bool:
+        return bool(self.networks)
+
+    def __contains__(self, address: str) -> bool:
+        if not self.networks or not address:
+            return False
+
+        try:
+            parsed_address = ip_address(address)
+        except ValueError:
+            return False
+
+        if self.tries is not None:
+            return str(parsed_address) in self.tries[parsed_address.version]
+
+        address_int = int(parsed_address)
+        for netmask, network_addresses in self.buckets[parsed_address.version]:  # type: ignore
+            if address_int & netmask in network_addresses:
+                return True
+
+        return False
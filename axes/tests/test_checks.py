@@ -38,6 +38,23 @@ class CacheCheckTestCase(AxesTestCase):
         warnings = run_checks()
         self.assertEqual(warnings, [])
 
+    @override_settings(
+        AXES_HANDLER='axes.handlers.database.AxesDatabaseHandler',
+        AXES_CACHE_FAILURES=True,
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    )
+    def test_cache_check_warnings_with_cached_failures(self):
+        warnings = run_checks()
+        warning = Warning(
+            msg=Messages.CACHE_FAILURES_INVALID,
+            hint=Hints.CACHE_FAILURES_INVALID,
+            id=Codes.CACHE_FAILURES_INVALID,
+        )
+
+        self.assertEqual(warnings, [
+            warning,
+        ])
+
 
 class MiddlewareCheckTestCase(AxesTestCase):
     @modify_settings(
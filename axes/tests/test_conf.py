@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from axes.conf import settings, snapshot
+from axes.tests.base import AxesTestCase
+
+
+class SettingsSnapshotTestCase(AxesTestCase):
+    def test_snapshot_matches_settings(self):
+        for name in ('AXES_FAILURE_LIMIT', 'AXES_LOCK_OUT_AT_FAILURE', 'AXES_USERNAME_FORM_FIELD'):
+            with self.subTest(name):
+                self.assertEqual(getattr(snapshot, name), getattr(settings, name))
+
+    def test_snapshot_reloads_on_setting_changed(self):
+        with override_settings(AXES_FAILURE_LIMIT=42):
+            self.assertEqual(snapshot.AXES_FAILURE_LIMIT, 42)
+        self.assertEqual(snapshot.AXES_FAILURE_LIMIT, settings.AXES_FAILURE_LIMIT)
+
+    @override_settings(AXES_IP_WHITELIST=['127.0.0.1', '127.0.0.1'], AXES_IP_BLACKLIST=None)
+    def test_snapshot_ip_lists_are_frozensets(self):
+        self.assertEqual(snapshot.AXES_IP_WHITELIST, frozenset(['127.0.0.1']))
+        self.assertEqual(snapshot.AXES_IP_BLACKLIST, frozenset())
+
+    @override_settings(AXES_IP_WHITELIST=['127.0.0.1'])
+    def test_snapshot_reload_assigns_values_after_computing_them(self):
+        with patch.object(settings, 'AXES_FAILURE_LIMIT', 42), patch('axes.conf.IPNetworkSet', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                snapshot.reload()
+
+        self.assertEqual(snapshot.AXES_FAILURE_LIMIT, settings.AXES_FAILURE_LIMIT)
+        self.assertEqual(snapshot.AXES_IP_WHITELIST, frozenset(['127.0.0.1']))
@@ -4,9 +4,11 @@ from django.test import override_settings
 from django.utils.timezone import timedelta
 
 from axes.conf import settings
+from axes.handlers.base import AxesHandler
 from axes.handlers.proxy import AxesProxyHandler
+from axes.models import AccessAttempt
 from axes.tests.base import AxesTestCase
-from axes.helpers import get_client_str
+from axes.helpers import get_client_cache_key, get_client_str
 
 
 @override_settings(AXES_HANDLER='axes.handlers.base.AxesHandler')
@@ -31,11 +33,73 @@ class AxesHandlerTestCase(AxesTestCase):
         self.request.method = 'GET'
         self.assertTrue(AxesProxyHandler.is_allowed(self.request))
 
+    @override_settings(
+        AXES_NEVER_LOCKOUT_GET=True,
+        AXES_IP_BLACKLIST=['127.0.0.1'],
+    )
+    def test_is_allowed_with_whitelisted_method_and_blacklisted_ip_address(self):
+        self.request.method = 'GET'
+        self.assertFalse(AxesProxyHandler.is_allowed(self.request))
+
     @override_settings(AXES_LOCK_OUT_AT_FAILURE=False)
     def test_is_allowed_no_lock_out(self):
         self.assertTrue(AxesProxyHandler.is_allowed(self.request))
 
 
+class AxesHandlerSubclassTestCase(AxesTestCase):
+    class WhitelistingHandler(AxesHandler):
+        def is_whitelisted(self, request, credentials: dict = None) -> bool:
+            return True
+
+    class LockingHandler(AxesHandler):
+        def is_locked(self, request, credentials: dict = None) -> bool:
+            return True
+
+    class CustomChecksHandler(AxesHandler):
+        def is_blacklisted(self, request, credentials: dict = None) -> bool:
+            return super().is_blacklisted(request, credentials)
+
+        def get_failures(self, request, credentials: dict = None) -> int:
+            return request.axes_failures
+
+    @override_settings(AXES_IP_BLACKLIST=['127.0.0.1'])
+    def test_custom_checks_blacklisted_ip_address(self):
+        self.assertFalse(self.CustomChecksHandler().is_allowed(self.request))
+
+    @override_settings(AXES_NEVER_LOCKOUT_WHITELIST=True, AXES_IP_WHITELIST=['127.0.0.1'])
+    def test_custom_checks_whitelisted_ip_address(self):
+        self.assertTrue(self.CustomChecksHandler().is_allowed(self.request))
+
+    @override_settings(AXES_NEVER_LOCKOUT_GET=True)
+    def test_custom_checks_whitelisted_method(self):
+        self.request.method = 'GET'
+        self.assertTrue(self.CustomChecksHandler().is_allowed(self.request))
+
+    def test_custom_checks_locked(self):
+        self.request.axes_failures = settings.AXES_FAILURE_LIMIT
+        self.assertFalse(self.CustomChecksHandler().is_allowed(self.request))
+
+    def test_custom_checks_not_locked(self):
+        self.request.axes_failures = 0
+        self.assertTrue(self.CustomChecksHandler().is_allowed(self.request))
+
+    @patch.object(LockingHandler, 'is_blacklisted', return_value=True)
+    def test_is_allowed_with_patched_blacklist(self, is_blacklisted):
+        self.assertFalse(self.LockingHandler().is_allowed(self.request))
+        self.assertTrue(is_blacklisted.called)
+
+    @patch.object(LockingHandler, 'is_whitelisted', return_value=True)
+    def test_is_allowed_with_patched_whitelist(self, is_whitelisted):
+        self.assertTrue(self.LockingHandler().is_allowed(self.request))
+        self.assertTrue(is_whitelisted.called)
+
+    def test_is_allowed_with_overridden_whitelist(self):
+        self.assertTrue(self.WhitelistingHandler().is_allowed(self.request))
+
+    def test_is_allowed_with_default_whitelist(self):
+        self.assertFalse(self.LockingHandler().is_allowed(self.request))
+
+
 class AxesProxyHandlerTestCase(AxesTestCase):
     def setUp(self):
         self.sender = MagicMock()
@@ -128,6 +192,134 @@ class AxesDatabaseHandlerTestCase(AxesHandlerBaseTestCase):
         self.assertFalse(AxesProxyHandler().is_locked(self.request, self.credentials))
         self.assertEqual(1, is_whitelisted.call_count)
 
+    @override_settings(
+        AXES_NEVER_LOCKOUT_WHITELIST=True,
+        AXES_IP_WHITELIST=['127.0.0.1'],
+        AXES_IP_BLACKLIST=['127.0.0.1'],
+    )
+    def test_user_login_failed_whitelisted_and_blacklisted_ip_address(self):
+        AxesProxyHandler.user_login_failed(sender=None, credentials=self.credentials, request=self.request)
+        self.assertFalse(AccessAttempt.objects.exists())
+
+
+@override_settings(AXES_CACHE_FAILURES=True)
+class AxesDatabaseHandlerCacheFailuresTestCase(AxesDatabaseHandlerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.handler = AxesProxyHandler.get_implementation()
+        self.cache_key = get_client_cache_key(self.request, self.credentials)
+
+    def test_is_locked_cached_below_limit(self):
+        self.handler.set_cached_failures(self.cache_key, 0)
+        with self.assertNumQueries(0):
+            self.assertFalse(self.handler.is_locked(self.request, self.credentials))
+
+    def test_is_locked_cached_at_limit_checks_database(self):
+        self.handler.set_cached_failures(self.cache_key, settings.AXES_FAILURE_LIMIT)
+        self.assertFalse(self.handler.is_locked(self.request, self.credentials))
+
+    def test_is_locked_caches_failures(self):
+        self.create_attempt(failures_since_start=2)
+        self.assertFalse(self.handler.is_locked(self.request, self.credentials))
+        self.assertEqual(self.handler.get_cached_failures(self.cache_key), 2)
+
+    def test_is_locked_does_not_overwrite_cached_failures(self):
+        self.create_attempt(failures_since_start=2)
+        self.handler.set_cached_failures(self.cache_key, 3)
+        self.handler.get_failures(self.request, self.credentials)
+        self.assertEqual(self.handler.get_cached_failures(self.cache_key), 3)
+
+    def test_login_failure_caches_failures(self):
+        self.login()
+        self.assertEqual(self.handler.get_cached_failures(self.cache_key), 1)
+
+    def test_attempt_changes_invalidate_cached_failures(self):
+        attempt = self.create_attempt()
+
+        self.handler.set_cached_failures(self.cache_key, 1)
+        attempt.save()
+        self.assertIsNone(self.handler.get_cached_failures(self.cache_key))
+
+        self.handler.set_cached_failures(self.cache_key, 1)
+        attempt.delete()
+        self.assertIsNone(self.handler.get_cached_failures(self.cache_key))
+
+
+@override_settings(AXES_ALLOWED_CACHE_TIMEOUT=1)
+class AxesDatabaseHandlerAllowedCacheTestCase(AxesDatabaseHandlerTestCase):
+    def check_login_failures_is_allowed_call_count(self, expected_status_code, expected_call_count):
+        handler = AxesProxyHandler.get_implementation()
+        with patch.object(handler, 'is_allowed', wraps=handler.is_allowed) as is_allowed:
+            for _ in range(3):
+                response = self.login(is_valid_username=True)
+                self.assertEqual(response.status_code, expected_status_code)
+
+        self.assertEqual(is_allowed.call_count, expected_call_count)
+
+    @override_settings(AXES_ALLOWED_CACHE_TIMEOUT=60, AXES_FAILURE_LIMIT=10)
+    def test_login_failures_allowed_decision_is_checked_again(self):
+        self.check_login_failures_is_allowed_call_count(self.STATUS_SUCCESS, 3)
+
+    @override_settings(AXES_ALLOWED_CACHE_TIMEOUT=60)
+    def test_login_failures_denied_decision_is_memoized(self):
+        self.create_attempt(failures_since_start=settings.AXES_FAILURE_LIMIT)
+        self.check_login_failures_is_allowed_call_count(self.BLOCKED, 1)
+
+
+@override_settings(AXES_ALLOWED_CACHE_TIMEOUT=60)
+class AxesProxyHandlerAllowedCacheTestCase(AxesTestCase):
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_is_allowed_memoized(self, handler):
+        handler.is_allowed.return_value = False
+
+        self.assertFalse(AxesProxyHandler.is_allowed(self.request, self.credentials))
+        self.assertFalse(AxesProxyHandler.is_allowed(self.request, self.credentials))
+        self.assertEqual(handler.is_allowed.call_count, 1)
+
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_is_allowed_memoized_per_method(self, handler):
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        self.request.method = 'GET'
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        self.assertEqual(handler.is_allowed.call_count, 2)
+
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_user_login_failed_resets_memoized(self, handler):
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        AxesProxyHandler.user_login_failed(sender=None, credentials=self.credentials, request=self.request)
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        self.assertEqual(handler.is_allowed.call_count, 2)
+
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_user_login_failed_keeps_memoized_denied(self, handler):
+        handler.is_allowed.return_value = False
+
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        AxesProxyHandler.user_login_failed(sender=None, credentials=self.credentials, request=self.request)
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        self.assertEqual(handler.is_allowed.call_count, 1)
+
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_user_logged_in_resets_memoized_denied(self, handler):
+        handler.is_allowed.return_value = False
+
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        AxesProxyHandler.user_logged_in(sender=None, request=self.request, user=self.user)
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        self.assertEqual(handler.is_allowed.call_count, 2)
+
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_user_logged_in_resets_memoized(self, handler):
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        AxesProxyHandler.user_logged_in(sender=None, request=self.request, user=self.user)
+        AxesProxyHandler.is_allowed(self.request, self.credentials)
+        self.assertEqual(handler.is_allowed.call_count, 2)
+
+    @patch('axes.handlers.proxy.AxesProxyHandler.implementation')
+    def test_user_login_failed_without_request(self, handler):
+        AxesProxyHandler.user_login_failed(sender=None, credentials=self.credentials, request=None)
+        self.assertTrue(handler.user_login_failed.called)
+
 
 @override_settings(
     AXES_HANDLER='axes.handlers.cache.AxesCacheHandler',
@@ -154,6 +346,26 @@ class AxesCacheHandlerTestCase(AxesHandlerBaseTestCase):
     def test_whitelist(self, log):
         self.check_whitelist(log)
 
+    def test_record_failure(self):
+        handler = AxesProxyHandler.get_implementation()
+        self.assertEqual(handler.get_failures(self.request, self.credentials), 0)
+        self.assertEqual(handler.record_failure(self.request, self.credentials), 1)
+        self.assertEqual(handler.record_failure(self.request, self.credentials), 2)
+        self.assertEqual(handler.get_failures(self.request, self.credentials), 2)
+
+    def test_record_failure_without_cache_touch(self):
+        handler = AxesProxyHandler.get_implementation()
+        with patch.object(handler.cache, 'touch', side_effect=NotImplementedError):
+            self.assertEqual(handler.record_failure(self.request, self.credentials), 1)
+            self.assertEqual(handler.record_failure(self.request, self.credentials), 2)
+        self.assertEqual(handler.get_failures(self.request, self.credentials), 2)
+
+    def test_record_failure_expired_between_add_and_incr(self):
+        handler = AxesProxyHandler.get_implementation()
+        with patch.object(handler.cache, 'add', return_value=False):
+            self.assertEqual(handler.record_failure(self.request, self.credentials), 1)
+        self.assertEqual(handler.get_failures(self.request, self.credentials), 1)
+
 
 @override_settings(
     AXES_HANDLER='axes.handlers.dummy.AxesDummyHandler',
@@ -0,0 +1,44 @@
+from axes.networks import IPNetworkSet, pytricia
+from axes.tests.base import AxesTestCase
+
+
+class IPNetworkSetTestCase(AxesTestCase):
+    NETWORKS = ['10.0.0.0/8', '192.168.1.0/24', '127.0.0.1/32', '2001:db8::/32']
+
+    def get_network_sets(self):
+        network_sets = [IPNetworkSet(self.NETWORKS, use_pytricia=False)]
+        if pytricia is not None:
+            network_sets.append(IPNetworkSet(self.NETWORKS, use_pytricia=True))
+        return network_sets
+
+    def test_contains(self):
+        for network_set in self.get_network_sets():
+            with self.subTest(tries=network_set.tries is not None):
+                self.assertIn('10.1.2.3', network_set)
+                self.assertIn('192.168.1.255', network_set)
+                self.assertIn('127.0.0.1', network_set)
+                self.assertIn('2001:db8::1', network_set)
+
+    def test_not_contains(self):
+        for network_set in self.get_network_sets():
+            with self.subTest(tries=network_set.tries is not None):
+                self.assertNotIn('11.0.0.1', network_set)
+                self.assertNotIn('192.168.2.1', network_set)
+                self.assertNotIn('127.0.0.2', network_set)
+                self.assertNotIn('2001:db9::1', network_set)
+
+    def test_invalid_address(self):
+        for network_set in self.get_network_sets():
+            with self.subTest(tries=network_set.tries is not None):
+                self.assertNotIn(None, network_set)
+                self.assertNotIn('', network_set)
+                self.assertNotIn('not-an-ip-address', network_set)
+
+    def test_empty(self):
+        network_set = IPNetworkSet()
+        self.assertFalse(network_set)
+        self.assertNotIn('127.0.0.1', network_set)
+
+    def test_invalid_network(self):
+        with self.assertRaises(ValueError):
+            IPNetworkSet(['10.0.0.0/33'])
@@ -1,28 +1,41 @@
 from datetime import timedelta
-from hashlib import md5
+from itertools import product
+from hashlib import blake2b
 from unittest.mock import patch
 
-from django.http import JsonResponse, HttpResponseRedirect, HttpResponse, HttpRequest
+from django.http import JsonResponse, HttpResponseRedirect, HttpResponse, HttpRequest, QueryDict
 from django.test import override_settings, RequestFactory
+import ipware.ip2
 
 from axes import get_version
 from axes.apps import AppConfig
+from axes.conf import IP_ADDRESS_BLACKLISTED, IP_ADDRESS_WHITELISTED
 from axes.models import AccessAttempt
 from axes.tests.base import AxesTestCase
 from axes.helpers import (
+    AccessDecision,
+    get_client_access_decision,
     get_cache_timeout,
     get_client_str,
     get_client_username,
     get_client_cache_key,
+    get_client_ip_address,
+    get_client_ip_address_from_header,
+    get_client_user_agent,
     get_client_parameters,
     get_cool_off_iso8601,
+    get_credentials,
+    get_ip_address_status,
     get_lockout_response,
+    get_query_str,
     is_client_ip_address_blacklisted,
     is_client_ip_address_whitelisted,
     is_ip_address_in_blacklist,
     is_ip_address_in_whitelist,
     is_client_method_whitelisted,
+    is_valid_ip_address,
     toggleable,
+    _is_valid_ip_address,
 )
 
 
@@ -46,6 +59,17 @@ class AxesDisabledTestCase(AxesTestCase):
         self.assertTrue(is_true())
         self.assertIsNone(toggleable(is_true)())
 
+    def test_toggleable_decorated_before_disabling(self):
+        def is_true():
+            return True
+
+        with override_settings(AXES_ENABLED=True):
+            toggleable_is_true = toggleable(is_true)
+            self.assertTrue(toggleable_is_true())
+
+        self.assertIsNone(toggleable_is_true())
+        self.assertEqual(toggleable_is_true.__name__, 'is_true')
+
 
 class CacheTestCase(AxesTestCase):
     @override_settings(AXES_COOLOFF_TIME=3)  # hours
@@ -91,6 +115,12 @@ class TimestampTestCase(AxesTestCase):
             with self.subTest(iso_duration):
                 self.assertEqual(get_cool_off_iso8601(delta), iso_duration)
 
+    def test_iso8601_memoized(self):
+        get_cool_off_iso8601.cache_clear()
+        get_cool_off_iso8601(timedelta(seconds=300))
+        get_cool_off_iso8601(timedelta(seconds=300))
+        self.assertEqual(get_cool_off_iso8601.cache_info().hits, 1)
+
 
 class ClientStringTestCase(AxesTestCase):
     @staticmethod
@@ -212,6 +242,29 @@ class ClientStringTestCase(AxesTestCase):
 
         self.assertEqual(expected, actual)
 
+    @override_settings(AXES_VERBOSE=True)
+    def test_verbose_client_details_with_braces(self):
+        username = 'test@example.com'
+        ip_address = '127.0.0.1'
+        user_agent = 'Mozilla/5.0 {0} {user_agent}'
+        path_info = '/admin/'
+
+        expected = '{username: "test@example.com", ip_address: "127.0.0.1", user_agent: "Mozilla/5.0 {0} {user_agent}", path_info: "/admin/"}'
+        actual = get_client_str(username, ip_address, user_agent, path_info)
+
+        self.assertEqual(expected, actual)
+
+
+class QueryStringTestCase(AxesTestCase):
+    @override_settings(AXES_PASSWORD_FORM_FIELD='secret')
+    def test_get_query_str_excludes_passwords(self):
+        query = QueryDict('username=example&password=hunter2&secret=hunter2&next=/admin/')
+        self.assertEqual(get_query_str(query), 'username=example\nnext=/admin/')
+
+    def test_get_query_str_truncates(self):
+        query = QueryDict('a=1&b=2&c=3')
+        self.assertEqual(get_query_str(query, max_length=5), 'a=1\nb')
+
 
 class ClientParametersTestCase(AxesTestCase):
     @override_settings(
@@ -274,7 +327,7 @@ class ClientCacheKeyTestCase(AxesTestCase):
         Test the cache key format.
         """
 
-        cache_hash_digest = md5(self.ip_address.encode()).hexdigest()
+        cache_hash_digest = blake2b(self.ip_address.encode(), digest_size=16).hexdigest()
         cache_hash_key = f'axes-{cache_hash_digest}'
 
         # Getting cache key from request
@@ -310,7 +363,7 @@ class ClientCacheKeyTestCase(AxesTestCase):
 
         empty_ip_address = ''
 
-        cache_hash_digest = md5(empty_ip_address.encode()).hexdigest()
+        cache_hash_digest = blake2b(empty_ip_address.encode(), digest_size=16).hexdigest()
         cache_hash_key = f'axes-{cache_hash_digest}'
 
         # Getting cache key from request
@@ -346,7 +399,7 @@ class ClientCacheKeyTestCase(AxesTestCase):
         """
 
         ip_address = self.ip_address
-        cache_hash_digest = md5(ip_address.encode()).hexdigest()
+        cache_hash_digest = blake2b(ip_address.encode(), digest_size=16).hexdigest()
         cache_hash_key = f'axes-{cache_hash_digest}'
 
         # Getting cache key from request
@@ -377,6 +430,31 @@ class ClientCacheKeyTestCase(AxesTestCase):
         )
         self.assertEqual(cache_hash_key, get_client_cache_key(attempt))
 
+    def test_get_cache_key_matches_client_parameters(self):
+        """
+        Test the specialized cache key components match the client parameters for every lockout configuration.
+        """
+
+        configurations = [
+            {'AXES_ONLY_USER_FAILURES': True},
+            {'AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP': True},
+            {'AXES_USE_USER_AGENT': True},
+            {'AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP': True, 'AXES_USE_USER_AGENT': True},
+        ]
+
+        attempt = AccessAttempt(
+            user_agent=self.user_agent,
+            ip_address=self.ip_address,
+            username=self.username,
+        )
+
+        for configuration in configurations:
+            with self.subTest(configuration), override_settings(**configuration):
+                filter_kwargs = get_client_parameters(self.username, self.ip_address, self.user_agent)
+                cache_key_components = ''.join(filter_kwargs.values())
+                cache_hash_digest = blake2b(cache_key_components.encode(), digest_size=16).hexdigest()
+                self.assertEqual(f'axes-{cache_hash_digest}', get_client_cache_key(attempt))
+
 
 class UsernameTestCase(AxesTestCase):
     @override_settings(AXES_USERNAME_FORM_FIELD='username')
@@ -467,11 +545,96 @@ class UsernameTestCase(AxesTestCase):
             'username',
         )
 
+    @override_settings(AXES_USERNAME_CALLABLE='axes.tests.test_utils.get_username')
+    @patch('axes.helpers.import_string', return_value=lambda request, credentials: 'username')
+    def test_get_client_username_str_imported_once(self, import_string):
+        get_client_username(HttpRequest(), {})
+        get_client_username(HttpRequest(), {})
+        self.assertEqual(import_string.call_count, 1)
+
+
+class CredentialsTestCase(AxesTestCase):
+    @override_settings(AXES_USERNAME_FORM_FIELD='email')
+    def test_get_credentials(self):
+        self.assertEqual(
+            get_credentials('example', password='secret'),
+            {'email': 'example', 'password': 'secret'},
+        )
+
 
 def get_username(request, credentials: dict) -> str:
     return 'username'
 
 
+class ClientAttributesTestCase(AxesTestCase):
+    @patch('axes.helpers.ipware.ip2.get_client_ip')
+    def test_get_client_ip_address_memoized(self, get_client_ip):
+        self.request.axes_ip_address = '127.0.0.2'
+        self.assertEqual(get_client_ip_address(self.request), '127.0.0.2')
+        self.assertFalse(get_client_ip.called)
+
+    def test_get_client_ip_address(self):
+        request = HttpRequest()
+        request.META['REMOTE_ADDR'] = '127.0.0.2'
+        self.assertEqual(get_client_ip_address(request), '127.0.0.2')
+
+    def test_get_client_ip_address_from_header_matches_ipware(self):
+        values = [
+            '',
+            ' ',
+            '127.0.0.1',
+            '8.8.8.8',
+            ' 8.8.8.8 , 10.0.0.1',
+            '10.0.0.1, 8.8.8.8',
+            ',,8.8.8.8,',
+            '2001:DB8::1, 127.0.0.1',
+            'not-an-ip-address',
+            'not-an-ip-address, 8.8.8.8',
+            '8.8.8.8, not-an-ip-address',
+            '8.8.8.8, not-an-ip-address, 10.0.0.1',
+            '8.8.8.8, ' + 'x' * 100,
+        ]
+
+        for proxy_order, header, value in product(['left-most', 'right-most'], ['HTTP_X_FORWARDED_FOR'], values):
+            request = HttpRequest()
+            request.META[header] = value
+
+            with self.subTest(proxy_order=proxy_order, value=value), override_settings(
+                    AXES_PROXY_ORDER=proxy_order,
+                    AXES_META_PRECEDENCE_ORDER=(header,),
+            ):
+                expected, _ = ipware.ip2.get_client_ip(
+                    request,
+                    proxy_order=proxy_order,
+                    request_header_order=(header,),
+                )
+                self.assertEqual(get_client_ip_address(request), expected)
+                self.assertEqual(get_client_ip_address_from_header(request, header), expected)
+
+    def test_is_valid_ip_address_memoizes_only_address_length_strings(self):
+        _is_valid_ip_address.cache_clear()
+
+        self.assertTrue(is_valid_ip_address('ffff:ffff:ffff:ffff:ffff:ffff:255.255.255.255'))
+        self.assertFalse(is_valid_ip_address('x' * 100))
+        self.assertEqual(_is_valid_ip_address.cache_info().currsize, 1)
+
+    @override_settings(AXES_PROXY_COUNT=1, AXES_META_PRECEDENCE_ORDER=('HTTP_X_FORWARDED_FOR',))
+    def test_get_client_ip_address_with_proxy_count_uses_ipware(self):
+        request = HttpRequest()
+        request.META['HTTP_X_FORWARDED_FOR'] = '8.8.8.8'
+        self.assertIsNone(get_client_ip_address(request))
+
+    @override_settings(AXES_META_PRECEDENCE_ORDER=('HTTP_X_FORWARDED_FOR', 'REMOTE_ADDR'))
+    @patch('axes.helpers.ipware.ip2.get_client_ip', return_value=('8.8.8.8', True))
+    def test_get_client_ip_address_with_multiple_headers_uses_ipware(self, get_client_ip):
+        self.assertEqual(get_client_ip_address(HttpRequest()), '8.8.8.8')
+        self.assertTrue(get_client_ip.called)
+
+    def test_get_client_user_agent_memoized(self):
+        self.request.axes_user_agent = 'memoized-user-agent'
+        self.assertEqual(get_client_user_agent(self.request), 'memoized-user-agent')
+
+
 class IPWhitelistTestCase(AxesTestCase):
     def setUp(self):
         self.request = HttpRequest()
@@ -488,6 +651,11 @@ class IPWhitelistTestCase(AxesTestCase):
         self.assertTrue(is_ip_address_in_whitelist('127.0.0.1'))
         self.assertFalse(is_ip_address_in_whitelist('127.0.0.2'))
 
+    @override_settings(AXES_IP_WHITELIST=['10.0.0.0/8'])
+    def test_ip_in_whitelist_network(self):
+        self.assertTrue(is_ip_address_in_whitelist('10.1.2.3'))
+        self.assertFalse(is_ip_address_in_whitelist('127.0.0.1'))
+
     @override_settings(AXES_IP_BLACKLIST=None)
     def test_ip_in_blacklist_none(self):
         self.assertFalse(is_ip_address_in_blacklist('127.0.0.2'))
@@ -497,6 +665,18 @@ class IPWhitelistTestCase(AxesTestCase):
         self.assertTrue(is_ip_address_in_blacklist('127.0.0.1'))
         self.assertFalse(is_ip_address_in_blacklist('127.0.0.2'))
 
+    @override_settings(AXES_IP_BLACKLIST=['10.0.0.0/8'])
+    def test_ip_in_blacklist_network(self):
+        self.assertTrue(is_ip_address_in_blacklist('10.1.2.3'))
+        self.assertFalse(is_ip_address_in_blacklist('127.0.0.1'))
+
+    @override_settings(AXES_IP_BLACKLIST=['127.0.0.1', '10.0.0.0/8'], AXES_IP_WHITELIST=['127.0.0.1', '10.1.0.0/16'])
+    def test_get_ip_address_status(self):
+        self.assertEqual(get_ip_address_status('127.0.0.1'), IP_ADDRESS_BLACKLISTED | IP_ADDRESS_WHITELISTED)
+        self.assertEqual(get_ip_address_status('10.1.2.3'), IP_ADDRESS_BLACKLISTED | IP_ADDRESS_WHITELISTED)
+        self.assertEqual(get_ip_address_status('10.2.3.4'), IP_ADDRESS_BLACKLISTED)
+        self.assertEqual(get_ip_address_status('127.0.0.2'), 0)
+
     @override_settings(AXES_IP_BLACKLIST=['127.0.0.1'])
     def test_is_client_ip_address_blacklisted_ip_in_blacklist(self):
         self.assertTrue(is_client_ip_address_blacklisted(self.request))
@@ -530,6 +710,54 @@ class IPWhitelistTestCase(AxesTestCase):
     def test_is_client_ip_address_whitelisted_not(self):
         self.assertFalse(is_client_ip_address_whitelisted(self.request))
 
+    @override_settings(AXES_NEVER_LOCKOUT_WHITELIST=True)
+    @override_settings(AXES_IP_WHITELIST=['127.0.0.1'], AXES_IP_BLACKLIST=['127.0.0.1'])
+    def test_is_client_ip_address_whitelisted_and_blacklisted(self):
+        self.assertTrue(is_client_ip_address_whitelisted(self.request))
+
+
+class AccessDecisionTestCase(AxesTestCase):
+    def test_get_client_access_decision_matches_checks(self):
+        """
+        Test the single pass decision and the blacklist and whitelist checks against the access rules.
+        """
+
+        request = HttpRequest()
+        request.axes_ip_address = '127.0.0.1'
+
+        ip_lists = [None, ['127.0.0.1'], ['127.0.0.2']]
+        flags = [True, False]
+
+        for method, blacklist, whitelist, only_whitelist, never_lockout_whitelist, never_lockout_get in product(
+                ['GET', 'POST'], ip_lists, ip_lists, flags, flags, flags,
+        ):
+            request.method = method
+            configuration = {
+                'AXES_IP_BLACKLIST': blacklist,
+                'AXES_IP_WHITELIST': whitelist,
+                'AXES_ONLY_WHITELIST': only_whitelist,
+                'AXES_NEVER_LOCKOUT_WHITELIST': never_lockout_whitelist,
+                'AXES_NEVER_LOCKOUT_GET': never_lockout_get,
+            }
+
+            in_blacklist = request.axes_ip_address in (blacklist or ())
+            in_whitelist = request.axes_ip_address in (whitelist or ())
+
+            blacklisted = in_blacklist or (only_whitelist and not in_whitelist)
+            whitelisted = in_whitelist and (only_whitelist or never_lockout_whitelist)
+
+            if blacklisted:
+                expected = AccessDecision.DENY
+            elif whitelisted or (method == 'GET' and never_lockout_get):
+                expected = AccessDecision.ALLOW
+            else:
+                expected = AccessDecision.CHECK_LOCK
+
+            with self.subTest(method=method, **configuration), override_settings(**configuration):
+                self.assertEqual(is_client_ip_address_blacklisted(request), blacklisted)
+                self.assertEqual(is_client_ip_address_whitelisted(request), whitelisted)
+                self.assertEqual(get_client_access_decision(request), expected)
+
 
 class MethodWhitelistTestCase(AxesTestCase):
     def setUp(self):
@@ -553,6 +781,12 @@ class LockoutResponseTestCase(AxesTestCase):
     def test_get_lockout_response_cool_off(self):
         get_lockout_response(request=self.request)
 
+    @override_settings(AXES_COOLOFF_TIME=42)
+    def test_get_lockout_response_cool_off_json(self):
+        self.request.is_ajax = lambda: True
+        response = get_lockout_response(request=self.request)
+        self.assertContains(response, '"cooloff_time": "P1DT18H"', status_code=403)
+
     @override_settings(AXES_LOCKOUT_TEMPLATE='example.html')
     @patch('axes.helpers.render')
     def test_get_lockout_response_lockout_template(self, render):
@@ -573,3 +807,9 @@ class LockoutResponseTestCase(AxesTestCase):
     def test_get_lockout_response_lockout_response(self):
         response = get_lockout_response(request=self.request)
         self.assertEqual(type(response), HttpResponse)
+
+    @patch('axes.helpers.get_client_username')
+    def test_get_lockout_response_lockout_response_without_context(self, get_client_username):
+        response = get_lockout_response(request=self.request)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(get_client_username.called)
@@ -38,6 +38,9 @@ setup(
         'django-appconf>=1.0.3',
         'django-ipware>=2.0.2',
     ],
+    extras_require={
+        'pytricia': ['pytricia'],
+    },
     include_package_data=True,
     packages=find_packages(),
     classifiers=[